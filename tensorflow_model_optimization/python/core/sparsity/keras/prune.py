@@ -56,6 +56,7 @@ def prune_low_magnitude(to_prune,
                         pruning_schedule=pruning_sched.ConstantSparsity(0.5, 0),
                         block_size=(1, 1),
                         block_pooling_type='AVG',
+                        sparsity_m_by_n=None,
                         **kwargs):
   """Modify a tf.keras layer or model to be pruned during training.
 
@@ -131,6 +132,11 @@ def prune_low_magnitude(to_prune,
         sparse pattern in rank-2 weight tensors.
       block_pooling_type: (optional) The function to use to pool weights in the
         block. Must be 'AVG' or 'MAX'.
+      sparsity_m_by_n: (optional) A tuple of two integers (m, n) to prune the
+        weights to m out of every n consecutive input channel values, e.g.
+        (2, 4) for sparse tensor core acceleration. When set, the sparsity of
+        the pruning_schedule is ignored and the schedule only controls when
+        the masks are updated. Can not be used together with block_size.
       **kwargs: Additional keyword arguments to be passed to the keras layer.
         Ignored when to_prune is not a keras layer.
 
@@ -168,7 +174,8 @@ def prune_low_magnitude(to_prune,
   params = {
       'pruning_schedule': pruning_schedule,
       'block_size': block_size,
-      'block_pooling_type': block_pooling_type
+      'block_pooling_type': block_pooling_type,
+      'sparsity_m_by_n': sparsity_m_by_n
   }
   is_sequential_or_functional = isinstance(
       to_prune, keras.Model) and (isinstance(to_prune, keras.Sequential) or
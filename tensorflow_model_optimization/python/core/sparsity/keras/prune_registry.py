@@ -121,12 +121,12 @@ class PruneRegistry(object):
       layers.SimpleRNN,
   })
 
-  _RNN_CELLS_STR = ', '.join(str(_RNN_CELLS_WEIGHTS_MAP.keys()))
+  _RNN_CELLS_STR = ', '.join(str(cell) for cell in _RNN_CELLS_WEIGHTS_MAP)
 
   _RNN_CELL_ERROR_MSG = (
-      'RNN Layer {} contains cell type {} which is either not supported or does'
-      'not inherit PrunableLayer. The cell must be one of {}, or implement '
-      'PrunableLayer.')
+      'RNN Layer {} contains cell type {} which is either not supported or '
+      'does not inherit PrunableLayer. The cell must be one of {}, or '
+      'implement PrunableLayer.')
 
   @classmethod
   def supports(cls, layer):
@@ -181,27 +181,43 @@ class PruneRegistry(object):
     if not cls.supports(layer):
       raise ValueError('Layer ' + str(layer.__class__) + ' is not supported.')
 
+    return cls._make_prunable(layer)
+
+  @classmethod
+  def _make_prunable(cls, layer):
+    """Same as `make_prunable`, for layers already known to be supported."""
+
+    is_rnn_layer = cls._is_rnn_layer(layer)
+
+    # The weights only exist once the layer is built, but which weights to
+    # return is known now. Resolve that once rather than on every call to
+    # get_prunable_weights.
+    if is_rnn_layer:
+      rnn_cells = cls._get_rnn_cells(layer)
+    else:
+      weight_names = cls._weight_names(layer)
+
     def get_prunable_weights():
-      return [getattr(layer, weight) for weight in cls._weight_names(layer)]
+      return [getattr(layer, weight) for weight in weight_names]
 
     def get_prunable_weights_rnn():  # pylint: disable=missing-docstring
       def get_prunable_weights_rnn_cell(cell):
-        if cell.__class__ in cls._RNN_CELLS_WEIGHTS_MAP:
-          return [getattr(cell, weight)
-                  for weight in cls._RNN_CELLS_WEIGHTS_MAP[cell.__class__]]
+        cell_weight_names = cls._RNN_CELLS_WEIGHTS_MAP.get(cell.__class__)
+        if cell_weight_names is not None:
+          return [getattr(cell, weight) for weight in cell_weight_names]
 
         if isinstance(cell, prunable_layer.PrunableLayer):
           return cell.get_prunable_weights()
 
         raise ValueError(cls._RNN_CELL_ERROR_MSG.format(
-            layer.__class__, cell.__class__, cls._RNN_CELLS_WEIGHTS_MAP.keys()))
+            layer.__class__, cell.__class__, cls._RNN_CELLS_STR))
 
       prunable_weights = []
-      for rnn_cell in cls._get_rnn_cells(layer):
+      for rnn_cell in rnn_cells:
         prunable_weights.extend(get_prunable_weights_rnn_cell(rnn_cell))
       return prunable_weights
 
-    if cls._is_rnn_layer(layer):
+    if is_rnn_layer:
       layer.get_prunable_weights = get_prunable_weights_rnn
     else:
       layer.get_prunable_weights = get_prunable_weights
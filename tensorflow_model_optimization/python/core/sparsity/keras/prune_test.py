@@ -26,6 +26,7 @@ from tensorflow.python.keras import keras_parameterized
 from tensorflow_model_optimization.python.core.keras import test_utils as keras_test_utils
 from tensorflow_model_optimization.python.core.sparsity.keras import prunable_layer
 from tensorflow_model_optimization.python.core.sparsity.keras import prune
+from tensorflow_model_optimization.python.core.sparsity.keras import pruning_callbacks
 from tensorflow_model_optimization.python.core.sparsity.keras import pruning_schedule
 from tensorflow_model_optimization.python.core.sparsity.keras import pruning_wrapper
 
@@ -219,6 +220,33 @@ class PruneTest(test.TestCase, parameterized.TestCase):
         np.random.rand(1000, 100),
         keras.utils.to_categorical(np.random.randint(2, size=(1000, 1))))
 
+  @keras_parameterized.run_all_keras_modes
+  def testPruneWithMByNSparsity(self):
+    model = prune.prune_low_magnitude(
+        keras.Sequential([
+            layers.Dense(8, activation='relu', input_shape=(8,)),
+            layers.Dense(4, activation='sigmoid')
+        ]),
+        sparsity_m_by_n=(2, 4),
+        **self.params)
+
+    model.compile(
+        loss=keras.losses.categorical_crossentropy,
+        optimizer=keras.optimizers.SGD(),
+        metrics=['accuracy'])
+    model.fit(
+        np.random.rand(20, 8),
+        keras.utils.to_categorical(np.random.randint(4, size=(20, 1)), 4),
+        batch_size=20,
+        callbacks=[pruning_callbacks.UpdatePruningStep()])
+
+    for layer in model.layers:
+      # Group every 4 consecutive input channels of each output channel.
+      kernel = keras.backend.get_value(layer.layer.kernel)
+      groups = np.reshape(np.transpose(kernel), [-1, 4])
+      self.assertAllEqual(
+          np.full([groups.shape[0]], 2), np.count_nonzero(groups, axis=1))
+
   def testPruneSequentialModel(self):
     # No InputLayer
     model = keras.Sequential([
@@ -19,7 +19,6 @@ from __future__ import division
 from __future__ import print_function
 
 # import g3
-import numpy as np
 import tensorflow as tf
 
 from tensorflow_model_optimization.python.core.keras import compat
@@ -30,12 +29,23 @@ callbacks = tf.keras.callbacks
 
 
 def _collect_prunable_layers(model):
-  """Recursively collect the prunable layers in the model."""
+  """Collect the prunable layers in the model and any nested models.
+
+  Layers (and nested models) shared between several places in the model are
+  only collected once.
+  """
   prunable_layers = []
-  for layer in model.layers:
+  visited = set()
+  stack = list(reversed(model.layers))
+  while stack:
+    layer = stack.pop()
+    if id(layer) in visited:
+      continue
+    visited.add(id(layer))
+
     # A keras model may have other models as layers.
     if isinstance(layer, tf.keras.Model):
-      prunable_layers += _collect_prunable_layers(layer)
+      stack.extend(reversed(layer.layers))
     if isinstance(layer, pruning_wrapper.PruneLowMagnitude):
       prunable_layers.append(layer)
 
@@ -59,18 +69,24 @@ class UpdatePruningStep(callbacks.Callback):
   def __init__(self):
     super(UpdatePruningStep, self).__init__()
     self.prunable_layers = []
+    self._pruning_steps = None
 
   def on_train_begin(self, logs=None):
     # Collect all the prunable layers in the model.
     self.prunable_layers = _collect_prunable_layers(self.model)
+    self._pruning_steps = None
     self.step = K.get_value(self.model.optimizer.iterations)
 
   def on_train_batch_begin(self, batch, logs=None):
-    tuples = []
-    for layer in self.prunable_layers:
-      tuples.append((layer.pruning_step, self.step))
-
-    K.batch_set_value(tuples)
+    # The pruning_step variables are fixed for the whole training run, so only
+    # look them up on the first batch.
+    if self._pruning_steps is None:
+      self._pruning_steps = [
+          layer.pruning_step for layer in self.prunable_layers
+      ]
+
+    K.batch_set_value(
+        [(pruning_step, self.step) for pruning_step in self._pruning_steps])
     self.step = self.step + 1
 
   def on_epoch_end(self, batch, logs=None):
@@ -97,6 +113,19 @@ class PruningSummaries(callbacks.TensorBoard):
   def __init__(self, log_dir, update_freq='epoch', **kwargs):
     super(PruningSummaries, self).__init__(
         log_dir=log_dir, update_freq=update_freq, **kwargs)
+    # Lazily collected on the first epoch, since the model is only known once
+    # set_model has been called.
+    self._prunable_layers = None
+    self._masks = None
+    self._thresholds = None
+    self._sparsities = None
+
+  def set_model(self, model):
+    super(PruningSummaries, self).set_model(model)
+    self._prunable_layers = None
+    self._masks = None
+    self._thresholds = None
+    self._sparsities = None
 
   def _log_pruning_metrics(self, logs, prefix, step):
     if compat.is_v1_apis():
@@ -114,33 +143,45 @@ class PruningSummaries(callbacks.TensorBoard):
 
       file_writer.flush()
 
+  def _get_sparsities(self):
+    """Returns the sparsity of each mask, reduced before it is fetched."""
+    if tf.executing_eagerly():
+      return [1.0 - tf.math.reduce_mean(mask) for mask in self._masks]
+
+    # In graph mode, build the reductions once so that every epoch doesn't add
+    # new ops to the graph.
+    if self._sparsities is None:
+      self._sparsities = [
+          1.0 - tf.math.reduce_mean(mask) for mask in self._masks
+      ]
+    return self._sparsities
+
   def on_epoch_begin(self, epoch, logs=None):
     if logs is not None:
       super(PruningSummaries, self).on_epoch_begin(epoch, logs)
 
-    pruning_logs = {}
-    params = []
-    prunable_layers = _collect_prunable_layers(self.model)
-    for layer in prunable_layers:
-      for _, mask, threshold in layer.pruning_vars:
-        params.append(mask)
-        params.append(threshold)
-
-    params.append(self.model.optimizer.iterations)
-
-    values = K.batch_get_value(params)
+    if self._prunable_layers is None:
+      self._prunable_layers = _collect_prunable_layers(self.model)
+      self._masks, self._thresholds = [], []
+      for layer in self._prunable_layers:
+        for _, mask, threshold in layer.pruning_vars:
+          self._masks.append(mask)
+          self._thresholds.append(threshold)
+
+    # Fetch everything in a single call, then split the values back into the
+    # parallel lists above.
+    values = K.batch_get_value(
+        self._get_sparsities() + self._thresholds +
+        [self.model.optimizer.iterations])
+    sparsity_values = values[:len(self._masks)]
+    threshold_values = values[len(self._masks):-1]
     iteration = values[-1]
-    del values[-1]
-    del params[-1]
-
-    param_value_pairs = list(zip(params, values))
 
-    for mask, mask_value in param_value_pairs[::2]:
-      pruning_logs.update({
-          mask.name + '/sparsity': 1 - np.mean(mask_value)
-      })
+    pruning_logs = {}
+    for mask, sparsity_value in zip(self._masks, sparsity_values):
+      pruning_logs[mask.name + '/sparsity'] = sparsity_value
 
-    for threshold, threshold_value in param_value_pairs[1::2]:
-      pruning_logs.update({threshold.name + '/threshold': threshold_value})
+    for threshold, threshold_value in zip(self._thresholds, threshold_values):
+      pruning_logs[threshold.name + '/threshold'] = threshold_value
 
     self._log_pruning_metrics(pruning_logs, '', iteration)
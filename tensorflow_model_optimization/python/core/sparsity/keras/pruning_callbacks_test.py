@@ -31,6 +31,19 @@ keras = tf.keras
 errors_impl = tf.errors
 
 
+class _RecordingPruningSummaries(pruning_callbacks.PruningSummaries):
+  """PruningSummaries which also keeps the logs it writes."""
+
+  def __init__(self, log_dir, **kwargs):
+    super(_RecordingPruningSummaries, self).__init__(log_dir=log_dir, **kwargs)
+    self.pruning_logs = []
+
+  def _log_pruning_metrics(self, logs, prefix, step):
+    self.pruning_logs.append(logs)
+    super(_RecordingPruningSummaries, self)._log_pruning_metrics(
+        logs, prefix, step)
+
+
 class PruneCallbacksTest(tf.test.TestCase, parameterized.TestCase):
 
   _BATCH_SIZE = 20
@@ -59,6 +72,7 @@ class PruneCallbacksTest(tf.test.TestCase, parameterized.TestCase):
   def testUpdatePruningStepsAndLogsSummaries(self):
     log_dir = tempfile.mkdtemp()
     pruned_model, x_train, y_train = self._pruned_model_setup()
+    summaries_callback = _RecordingPruningSummaries(log_dir=log_dir)
     pruned_model.fit(
         x_train,
         y_train,
@@ -66,7 +80,7 @@ class PruneCallbacksTest(tf.test.TestCase, parameterized.TestCase):
         epochs=3,
         callbacks=[
             pruning_callbacks.UpdatePruningStep(),
-            pruning_callbacks.PruningSummaries(log_dir=log_dir)
+            summaries_callback
         ])
 
     self.assertEqual(
@@ -76,6 +90,17 @@ class PruneCallbacksTest(tf.test.TestCase, parameterized.TestCase):
 
     self._assertLogsExist(log_dir)
 
+    # Sparsity is logged at the start of each epoch. Both kernels are pruned
+    # to 50% on the first training step, so the first epoch logs 0.
+    self.assertLen(summaries_callback.pruning_logs, 3)
+    for logs, expected_sparsity in zip(summaries_callback.pruning_logs,
+                                       [0.0, 0.5, 0.5]):
+      sparsities = [
+          value for name, value in logs.items() if name.endswith('/sparsity')
+      ]
+      self.assertLen(sparsities, 2)
+      self.assertAllClose([expected_sparsity] * 2, sparsities)
+
   # This style of custom training loop isn't available in graph mode.
   @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
   def testUpdatePruningStepsAndLogsSummaries_CustomTrainingLoop(self):
@@ -116,6 +141,21 @@ class PruneCallbacksTest(tf.test.TestCase, parameterized.TestCase):
         2, tf.keras.backend.get_value(pruned_model.layers[1].pruning_step))
     self._assertLogsExist(log_dir)
 
+  def testCollectPrunableLayersVisitsSharedModelOnce(self):
+    inner_model = prune.prune_low_magnitude(
+        keras_test_utils.build_simple_dense_model())
+    # inner_model is reachable both directly and through outer_model.
+    outer_model = keras.Sequential([inner_model])
+    inp = keras.Input(shape=(10,))
+    x = inner_model(inp)
+    x = keras.layers.Dense(10)(x)
+    out = outer_model(x)
+    model = keras.Model(inp, out)
+
+    prunable_layers = pruning_callbacks._collect_prunable_layers(model)
+
+    self.assertEqual(inner_model.layers, prunable_layers)
+
   @keras_parameterized.run_all_keras_modes
   def testPruneTrainingRaisesError_PruningStepCallbackMissing(self):
     pruned_model, x_train, y_train = self._pruned_model_setup()
@@ -30,7 +30,7 @@ class Pruning(object):
   """Implementation of magnitude-based weight pruning."""
 
   def __init__(self, training_step_fn, pruning_vars, pruning_schedule,
-               block_size, block_pooling_type):
+               block_size, block_pooling_type, sparsity_m_by_n=None):
     """The logic for magnitude-based pruning weight tensors.
 
     Args:
@@ -42,18 +42,23 @@ class Pruning(object):
         in rank-2 weight tensors.
       block_pooling_type: (optional) The function to use to pool weights in the
         block. Must be 'AVG' or 'MAX'.
+      sparsity_m_by_n: (optional) A tuple of two integers (m, n). When set,
+        the m largest of every n consecutive weights along the input channel
+        dimension are kept, instead of pruning to the sparsity given by the
+        pruning schedule. The schedule still controls when the mask is
+        updated.
     """
     self._pruning_vars = pruning_vars
     self._pruning_schedule = pruning_schedule
     self._block_size = list(block_size)
     self._block_pooling_type = block_pooling_type
+    self._sparsity_m_by_n = sparsity_m_by_n
     self._validate_block()
+    self._validate_sparsity_m_by_n()
 
     # Training step
     self._step_fn = training_step_fn
 
-    self._validate_block()
-
   def _validate_block(self):
     if self._block_size != [1, 1]:
       for weight, _, _ in self._pruning_vars:
@@ -61,7 +66,27 @@ class Pruning(object):
           raise ValueError('Block Sparsity can only be used for layers which '
                            'have 2-dimensional weights.')
 
-  def _update_mask(self, weights):
+  def _validate_sparsity_m_by_n(self):
+    if self._sparsity_m_by_n is None:
+      return
+
+    if self._block_size != [1, 1]:
+      raise ValueError('m_by_n sparsity can not be used together with Block '
+                       'Sparsity.')
+
+    m, n = self._sparsity_m_by_n
+    if not 0 < m < n:
+      raise ValueError('m_by_n sparsity requires 0 < m < n. Got {}.'.format(
+          self._sparsity_m_by_n))
+
+    for weight, _, _ in self._pruning_vars:
+      shape = weight.get_shape().as_list()
+      if len(shape) < 2 or shape[-2] % n != 0:
+        raise ValueError(
+            'm_by_n sparsity can only be used for layers which have weights of '
+            'rank >= 2 whose second to last dimension is divisible by n.')
+
+  def _update_mask(self, weights, sparsity=None):
     """Updates the mask for a given weight tensor.
 
     This functions first estimates the threshold value such that
@@ -70,6 +95,8 @@ class Pruning(object):
 
     Args:
       weights: The weight tensor that needs to be masked.
+      sparsity: (optional) The target sparsity. Defaults to the sparsity given
+        by the pruning schedule at the current training step.
 
     Returns:
       new_threshold: The new value of the threshold based on weights, and
@@ -81,14 +108,16 @@ class Pruning(object):
     Raises:
       ValueError: if sparsity is not defined
     """
-    sparsity = self._pruning_schedule(self._step_fn())[1]
+    if sparsity is None:
+      sparsity = self._pruning_schedule(self._step_fn())[1]
     with tf.name_scope('pruning_ops'):
       abs_weights = tf.math.abs(weights)
       k = tf.dtypes.cast(
           tf.math.round(
               tf.dtypes.cast(tf.size(abs_weights), tf.float32) *
               (1 - sparsity)), tf.int32)
-      # Sort the entire array
+      # Sort the entire array. k depends on the pruning step, so it is not
+      # used as top_k's k, which must be a constant under XLA.
       values, _ = tf.math.top_k(
           tf.reshape(abs_weights, [-1]), k=tf.size(abs_weights))
       # Grab the (k-1)th value
@@ -98,7 +127,7 @@ class Pruning(object):
           tf.math.greater_equal(abs_weights, current_threshold), weights.dtype)
     return current_threshold, new_mask
 
-  def _maybe_update_block_mask(self, weights):
+  def _maybe_update_block_mask(self, weights, sparsity=None):
     """Performs block-granular masking of the weights.
 
     Block pruning occurs only if the block_height or block_width is > 1 and
@@ -106,6 +135,8 @@ class Pruning(object):
     pruning occurs.
     Args:
       weights: The weight tensor that needs to be masked.
+      sparsity: (optional) The target sparsity. Defaults to the sparsity given
+        by the pruning schedule at the current training step.
 
     Returns:
       new_threshold: The new value of the threshold based on weights, and
@@ -117,8 +148,14 @@ class Pruning(object):
     Raises:
       ValueError: if block pooling function is not AVG or MAX
     """
+    if self._sparsity_m_by_n is not None:
+      # The threshold isn't meaningful for m_by_n sparsity.
+      return (tf.zeros([], dtype=weights.dtype),
+              pruning_utils.generate_m_by_n_mask(weights,
+                                                 self._sparsity_m_by_n))
+
     if self._block_size == [1, 1]:
-      return self._update_mask(weights)
+      return self._update_mask(weights, sparsity)
 
     # TODO(pulkitb): Check if squeeze operations should now be removed since
     # we are only accepting 2-D weights.
@@ -135,7 +172,7 @@ class Pruning(object):
     if pooled_weights.get_shape().ndims != 2:
       pooled_weights = tf.squeeze(pooled_weights)
 
-    new_threshold, new_mask = self._update_mask(pooled_weights)
+    new_threshold, new_mask = self._update_mask(pooled_weights, sparsity)
 
     updated_mask = pruning_utils.expand_tensor(new_mask, self._block_size)
     sliced_mask = tf.slice(
@@ -197,29 +234,31 @@ class Pruning(object):
   def conditional_mask_update(self):
     """Returns an op to updates masks as per the pruning schedule."""
 
-    def maybe_update_masks():
-      return self._pruning_schedule(self._step_fn())[0]
-
     def no_update():
       return tf.no_op()
 
     def mask_update():
       """Updates mask without distribution strategy."""
+      # Evaluate the schedule once for all the weights in this layer.
+      should_prune, sparsity = self._pruning_schedule(self._step_fn())
 
       def update():
         assign_objs = []
 
         for weight, mask, threshold in self._pruning_vars:
-          new_threshold, new_mask = self._maybe_update_block_mask(weight)
+          new_threshold, new_mask = self._maybe_update_block_mask(
+              weight, sparsity)
           assign_objs.append(tf_compat.assign(threshold, new_threshold))
           assign_objs.append(tf_compat.assign(mask, new_mask))
 
         return tf.group(assign_objs)
 
-      return tf.cond(maybe_update_masks(), update, no_update)
+      return tf.cond(should_prune, update, no_update)
 
     def mask_update_distributed(distribution):
       """Updates mask with distribution strategy."""
+      # Evaluate the schedule once for all the weights in this layer.
+      should_prune, sparsity = self._pruning_schedule(self._step_fn())
 
       def update(var, value):
         return tf_compat.assign(var, value)
@@ -233,7 +272,8 @@ class Pruning(object):
         assign_objs = []
 
         for weight, mask, threshold in self._pruning_vars:
-          new_threshold, new_mask = self._maybe_update_block_mask(weight)
+          new_threshold, new_mask = self._maybe_update_block_mask(
+              weight, sparsity)
           assign_objs.append(
               distribution.extended.update(mask, update, (new_mask,)))
           assign_objs.append(
@@ -241,7 +281,7 @@ class Pruning(object):
 
         return tf.group(assign_objs)
 
-      return tf.cond(maybe_update_masks(), update_distributed, no_update)
+      return tf.cond(should_prune, update_distributed, no_update)
 
     if tf.distribute.get_replica_context():
       return tf.distribute.get_replica_context().merge_call(
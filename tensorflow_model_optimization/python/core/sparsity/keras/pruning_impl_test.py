@@ -29,7 +29,6 @@ from tensorflow.python.keras import keras_parameterized
 from tensorflow_model_optimization.python.core.keras import compat
 from tensorflow_model_optimization.python.core.sparsity.keras import pruning_impl
 from tensorflow_model_optimization.python.core.sparsity.keras import pruning_schedule
-from tensorflow_model_optimization.python.core.sparsity.keras import pruning_utils
 
 K = tf.keras.backend
 dtypes = tf.dtypes
@@ -72,7 +71,7 @@ class PruningTest(test.TestCase, parameterized.TestCase):
     compat.initialize_variables(self)
 
   def testUpdateSingleMask(self):
-    weight = tf.Variable(np.linspace(1.0, 100.0, 100), name="weights")
+    weight = tf.Variable(tf.linspace(1.0, 100.0, 100), name="weights")
     weight_dtype = weight.dtype.base_dtype
     mask = tf.Variable(
         tf.ones(weight.get_shape(), dtype=weight_dtype),
@@ -89,16 +88,70 @@ class PruningTest(test.TestCase, parameterized.TestCase):
         block_size=self.block_size,
         block_pooling_type=self.block_pooling_type)
 
-    mask_before_pruning = K.get_value(mask)
-    self.assertAllEqual(np.count_nonzero(mask_before_pruning), 100)
+    self.assertAllEqual(K.get_value(tf.math.count_nonzero(mask)), 100)
 
     if tf.executing_eagerly():
       p.conditional_mask_update()
     else:
       K.get_session().run(p.conditional_mask_update())
 
-    mask_after_pruning = K.get_value(mask)
-    self.assertAllEqual(np.count_nonzero(mask_after_pruning), 50)
+    self.assertAllEqual(K.get_value(tf.math.count_nonzero(mask)), 50)
+
+  def testUpdateSingleMaskMByN(self):
+    weight = tf.Variable(
+        tf.reshape(tf.linspace(1.0, 16.0, 16), [8, 2]), name="weights")
+    weight_dtype = weight.dtype.base_dtype
+    mask = tf.Variable(
+        tf.ones(weight.get_shape(), dtype=weight_dtype),
+        name="mask",
+        dtype=weight_dtype)
+    threshold = tf.Variable(
+        tf.zeros([], dtype=weight_dtype), name="threshold", dtype=weight_dtype)
+    self.initialize()
+
+    p = pruning_impl.Pruning(
+        pruning_vars=[(weight, mask, threshold)],
+        training_step_fn=self.training_step_fn,
+        pruning_schedule=self.constant_sparsity,
+        block_size=self.block_size,
+        block_pooling_type=self.block_pooling_type,
+        sparsity_m_by_n=(2, 4))
+
+    if tf.executing_eagerly():
+      p.conditional_mask_update()
+    else:
+      K.get_session().run(p.conditional_mask_update())
+
+    # weight is [[1, 2], [3, 4], ..., [15, 16]]. The 2 largest of every 4
+    # consecutive rows are kept in each column.
+    expected_mask = np.tile([[0.0, 0.0], [0.0, 0.0], [1.0, 1.0], [1.0, 1.0]],
+                            [2, 1])
+    self.assertAllEqual(expected_mask, K.get_value(mask))
+
+  def testMByNWithIndivisibleWeightsRaisesError(self):
+    weight = tf.Variable(tf.ones([6, 2]), name="weights")
+    self.initialize()
+
+    with self.assertRaises(ValueError):
+      pruning_impl.Pruning(
+          pruning_vars=[(weight, None, None)],
+          training_step_fn=self.training_step_fn,
+          pruning_schedule=self.constant_sparsity,
+          block_size=self.block_size,
+          block_pooling_type=self.block_pooling_type,
+          sparsity_m_by_n=(2, 4))
+
+  def testMByNWithBlockSizeRaisesError(self):
+    self.initialize()
+
+    with self.assertRaises(ValueError):
+      pruning_impl.Pruning(
+          pruning_vars=[],
+          training_step_fn=self.training_step_fn,
+          pruning_schedule=self.constant_sparsity,
+          block_size=(2, 2),
+          block_pooling_type=self.block_pooling_type,
+          sparsity_m_by_n=(2, 4))
 
   def testConstructsMaskAndThresholdCorrectly(self):
     self.initialize()
@@ -118,12 +171,10 @@ class PruningTest(test.TestCase, parameterized.TestCase):
 
   def _blockMasking(self, block_size, block_pooling_type, weight,
                     expected_mask):
-    mask = tf.Variable(
-        tf.ones(weight.get_shape(), dtype=weight.dtype),
-        name="mask",
-        dtype=weight.dtype)
-    threshold = tf.Variable(
-        tf.zeros([], dtype=weight.dtype), name="threshold", dtype=weight.dtype)
+    # Only the new mask is computed below, so the mask and threshold are never
+    # assigned to and don't need to be variables.
+    mask = tf.ones(weight.get_shape(), dtype=weight.dtype)
+    threshold = tf.zeros([], dtype=weight.dtype)
     self.initialize()
 
     # Set up pruning
@@ -177,7 +228,7 @@ class PruningTest(test.TestCase, parameterized.TestCase):
       self._blockMasking(block_size, block_pooling_type, weight, expected_mask)
 
   def testConditionalMaskUpdate(self):
-    weight = tf.Variable(np.linspace(1.0, 100.0, 100), name="weights")
+    weight = tf.Variable(tf.linspace(1.0, 100.0, 100), name="weights")
     weight_dtype = weight.dtype.base_dtype
     mask = tf.Variable(
         tf.ones(weight.get_shape(), dtype=weight_dtype),
@@ -187,10 +238,14 @@ class PruningTest(test.TestCase, parameterized.TestCase):
         tf.zeros([], dtype=weight_dtype), name="threshold", dtype=weight_dtype)
     self.initialize()
 
+    # Built once here rather than on every call to the schedule. They can't
+    # live at module scope, since each keras mode runs in its own graph.
+    sparsity_val = tf.constant(
+        [0.0, 0.1, 0.1, 0.3, 0.3, 0.5, 0.5, 0.5, 0.5, 0.5])
+    should_prune = tf.constant(True)
+
     def linear_sparsity(step):
-      sparsity_val = tf.convert_to_tensor(
-          [0.0, 0.1, 0.1, 0.3, 0.3, 0.5, 0.5, 0.5, 0.5, 0.5])
-      return tf.convert_to_tensor(True), sparsity_val[step]
+      return should_prune, sparsity_val[step]
 
     # Set up pruning
     p = pruning_impl.Pruning(
@@ -211,7 +266,7 @@ class PruningTest(test.TestCase, parameterized.TestCase):
         K.get_session().run(p.weight_mask_op())
         K.get_session().run(assign_add(self.global_step, 1))
 
-      non_zero_count.append(np.count_nonzero(K.get_value(weight)))
+      non_zero_count.append(K.get_value(tf.math.count_nonzero(weight)))
 
     # Weights pruned at steps 1,3,5
     expected_non_zero_count = [100, 90, 90, 70, 70, 50, 50, 50, 50, 50]
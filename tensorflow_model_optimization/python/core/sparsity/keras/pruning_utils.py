@@ -84,11 +84,10 @@ def expand_tensor(tensor, block_size):
     return tf.tile(tensor, [multiple, 1])
 
   def _generate_indices(num_rows, block_dim):
-    indices = np.zeros(shape=[num_rows * block_dim, 1], dtype=np.int32)
-    for k in range(block_dim):
-      for r in range(num_rows):
-        indices[k * num_rows + r] = r * block_dim + k
-    return indices
+    # indices[k * num_rows + r] = r * block_dim + k
+    indices = (np.arange(num_rows, dtype=np.int32)[np.newaxis, :] * block_dim +
+               np.arange(block_dim, dtype=np.int32)[:, np.newaxis])
+    return np.reshape(indices, [num_rows * block_dim, 1])
 
   def _replicate_rows(tensor, multiple):
     tensor_shape = tensor.shape.as_list()
@@ -157,3 +156,57 @@ def factorized_pool(input_tensor,
         padding=padding)
 
   return tf.squeeze(tf.transpose(width_pooling, perm=[0, 1, 3, 2]))
+
+
+def generate_m_by_n_mask(weights, m_by_n=(2, 4)):
+  """Generates a mask keeping the m largest of every n consecutive weights.
+
+  The weights are grouped along the input channel dimension (the second to
+  last dimension), which is the layout used by hardware with structured
+  sparsity support, e.g. 2:4 sparsity on NVIDIA Ampere Sparse Tensor Cores.
+
+  Example, for m_by_n = (2, 4):
+
+  weights = [[1, -5]
+             [4,  2]
+             [-3, 1]
+             [2,  6]]
+
+  result = [[0, 1]
+            [1, 0]
+            [1, 0]
+            [0, 1]]
+
+  Args:
+    weights: A weight tensor of rank >= 2, whose second to last dimension is
+      divisible by n.
+    m_by_n: A tuple of two integers (m, n). m out of every n weights are kept.
+
+  Returns:
+    A tensor with the same shape and dtype as weights, containing 1 for the
+    weights that are kept and 0 for the ones that are pruned.
+
+  Raises:
+    ValueError: if weights has rank < 2, or its second to last dimension is not
+    divisible by n.
+  """
+  m, n = m_by_n
+  shape = weights.get_shape().as_list()
+  rank = len(shape)
+  if rank < 2 or shape[-2] % n != 0:
+    raise ValueError(
+        'm_by_n sparsity requires weights of rank >= 2 whose second to last '
+        'dimension is divisible by {}. Got weights of shape {}.'.format(
+            n, shape))
+
+  # Move the output channels to the front so that the input channels become
+  # the innermost dimension, and split them into groups of n.
+  transposed_weights = tf.transpose(weights, [rank - 1] + list(range(rank - 1)))
+  groups = tf.reshape(tf.math.abs(transposed_weights), [-1, n])
+
+  _, top_indices = tf.math.top_k(groups, k=m)
+  groups_mask = tf.math.reduce_sum(
+      tf.one_hot(top_indices, n, dtype=weights.dtype), axis=-2)
+
+  mask = tf.reshape(groups_mask, [shape[-1]] + shape[:-1])
+  return tf.transpose(mask, list(range(1, rank)) + [0])
@@ -86,5 +86,36 @@ class PruningUtilsParameterizedTest(tf.test.TestCase, parameterized.TestCase):
     self._compare_expand_tensor_with_kronecker_product(weights, block_dim)
 
 
+class PruningUtilsTest(tf.test.TestCase):
+
+  def testGenerateMByNMask(self):
+    weights = tf.constant([[1., -5.], [4., 2.], [-3., 1.], [2., 6.]])
+    expected_mask = [[0., 1.], [1., 0.], [1., 0.], [0., 1.]]
+
+    mask = pruning_utils.generate_m_by_n_mask(weights, (2, 4))
+
+    self.assertAllEqual(expected_mask, self.evaluate(mask))
+
+  def testGenerateMByNMaskKeepsMPerGroupForConvKernel(self):
+    weights = tf.random.normal(shape=[3, 3, 8, 16])
+
+    mask = pruning_utils.generate_m_by_n_mask(weights, (2, 4))
+
+    self.assertAllEqual(weights.get_shape(), mask.get_shape())
+    # Every group of 4 consecutive input channels keeps exactly 2 weights.
+    groups = tf.reshape(mask, [3, 3, 2, 4, 16])
+    self.assertAllEqual(
+        self.evaluate(tf.fill([3, 3, 2, 16], 2.)),
+        self.evaluate(tf.reduce_sum(groups, 3)))
+
+  def testGenerateMByNMaskRaisesErrorForIndivisibleShape(self):
+    with self.assertRaises(ValueError):
+      pruning_utils.generate_m_by_n_mask(tf.ones([6, 2]), (2, 4))
+
+  def testGenerateMByNMaskRaisesErrorForRank1Weights(self):
+    with self.assertRaises(ValueError):
+      pruning_utils.generate_m_by_n_mask(tf.ones([8]), (2, 4))
+
+
 if __name__ == "__main__":
   tf.test.main()
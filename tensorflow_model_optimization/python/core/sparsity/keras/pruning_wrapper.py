@@ -64,6 +64,15 @@ class PruneLowMagnitude(Wrapper):
   while computing the distribution of the weight values and
   the threshold for pruning.
 
+  M by N sparse patterns:
+  Hardware such as NVIDIA Ampere Sparse Tensor Cores accelerates weights in
+  which at most m out of every n consecutive input channel values are non-zero
+  (e.g. 2:4). Setting sparsity_m_by_n to (m, n) keeps the m largest magnitude
+  weights of every such group, instead of pruning to the sparsity given by the
+  pruning schedule. The schedule still controls when the mask is updated.
+  No threshold is used in this mode, so the threshold variables stay at 0 and
+  the threshold summaries always log 0.
+
   Custom keras layers:
   The pruning wrapper can also be applied to a user-defined keras layer.
   Such a layer may contain one or more weight tensors that may be pruned.
@@ -99,6 +108,7 @@ class PruneLowMagnitude(Wrapper):
                pruning_schedule=pruning_sched.ConstantSparsity(0.5, 0),
                block_size=(1, 1),
                block_pooling_type='AVG',
+               sparsity_m_by_n=None,
                **kwargs):
     """Create a pruning wrapper for a keras layer.
 
@@ -112,11 +122,15 @@ class PruneLowMagnitude(Wrapper):
         sparse pattern in rank-2 weight tensors.
       block_pooling_type: (optional) The function to use to pool weights in the
         block. Must be 'AVG' or 'MAX'.
+      sparsity_m_by_n: (optional) A tuple of two integers (m, n) to prune the
+        weights to m out of every n consecutive input channel values, e.g.
+        (2, 4). Can not be used together with block_size.
       **kwargs: Additional keyword arguments to be passed to the keras layer.
     """
     self.pruning_schedule = pruning_schedule
     self.block_size = block_size
     self.block_pooling_type = block_pooling_type
+    self.sparsity_m_by_n = sparsity_m_by_n
 
     # An instance of the Pruning class. This class contains the logic to prune
     # the weights of this layer.
@@ -141,21 +155,32 @@ class PruneLowMagnitude(Wrapper):
     kwargs.update({'name': '{}_{}'.format(
         generic_utils.to_snake_case(self.__class__.__name__), layer.name)})
 
-    if isinstance(layer, prunable_layer.PrunableLayer):
-      # Custom layer in client code which supports pruning.
-      super(PruneLowMagnitude, self).__init__(layer, **kwargs)
-    elif prune_registry.PruneRegistry.supports(layer):
-      # Built-in keras layers which support pruning.
-      super(PruneLowMagnitude, self).__init__(
-          prune_registry.PruneRegistry.make_prunable(layer), **kwargs)
-    else:
-      raise ValueError(
-          'Please initialize `Prune` with a supported layer. Layers should '
-          'either be a `PrunableLayer` instance, or should be supported by the '
-          'PruneRegistry. You passed: {input}'.format(input=layer.__class__))
+    # Custom layers in client code support pruning by implementing
+    # PrunableLayer. Built-in keras layers are made prunable by the registry.
+    if not isinstance(layer, prunable_layer.PrunableLayer):
+      if not prune_registry.PruneRegistry.supports(layer):
+        raise ValueError(
+            'Please initialize `Prune` with a supported layer. Layers should '
+            'either be a `PrunableLayer` instance, or should be supported by '
+            'the PruneRegistry. You passed: {input}'.format(
+                input=layer.__class__))
+      # Support was just checked, so skip the registry's own check.
+      layer = prune_registry.PruneRegistry._make_prunable(layer)
+
+    super(PruneLowMagnitude, self).__init__(layer, **kwargs)
 
     self._track_trackable(layer, name='layer')
 
+    # The signature of the wrapped layer's call doesn't change, so inspect it
+    # once here instead of on every call.
+    # TODO(evcu) remove this check after dropping py2 support. In py3 getargspec
+    # is deprecated.
+    if hasattr(inspect, 'getfullargspec'):
+      args = inspect.getfullargspec(self.layer.call).args
+    else:
+      args = inspect.getargspec(self.layer.call).args
+    self._layer_call_has_training_arg = 'training' in args
+
     # TODO(yunluli): Work-around to handle the first layer of Sequential model
     # properly. Can remove this when it is implemented in the Wrapper base
     # class.
@@ -227,7 +252,8 @@ class PruneLowMagnitude(Wrapper):
         pruning_vars=self.pruning_vars,
         pruning_schedule=self.pruning_schedule,
         block_size=self.block_size,
-        block_pooling_type=self.block_pooling_type)
+        block_pooling_type=self.block_pooling_type,
+        sparsity_m_by_n=self.sparsity_m_by_n)
 
   def call(self, inputs, training=None):
     if training is None:
@@ -255,15 +281,9 @@ class PruneLowMagnitude(Wrapper):
     #
     # self.add_update does nothing during eager execution.
     self.add_update(self.pruning_obj.weight_mask_op())
-    # TODO(evcu) remove this check after dropping py2 support. In py3 getargspec
-    # is deprecated.
-    if hasattr(inspect, 'getfullargspec'):
-      args = inspect.getfullargspec(self.layer.call).args
-    else:
-      args = inspect.getargspec(self.layer.call).args
     # Propagate the training bool to the underlying layer if it accepts
     # training as an arg.
-    if 'training' in args:
+    if self._layer_call_has_training_arg:
       return self.layer.call(inputs, training=training)
 
     return self.layer.call(inputs)
@@ -276,7 +296,8 @@ class PruneLowMagnitude(Wrapper):
     config = {
         'pruning_schedule': self.pruning_schedule.get_config(),
         'block_size': self.block_size,
-        'block_pooling_type': self.block_pooling_type
+        'block_pooling_type': self.block_pooling_type,
+        'sparsity_m_by_n': self.sparsity_m_by_n
     }
     return dict(list(base_config.items()) + list(config.items()))
 
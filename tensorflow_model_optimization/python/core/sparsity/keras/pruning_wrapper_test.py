@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
+
 import tensorflow as tf
 
 from tensorflow_model_optimization.python.core.sparsity.keras import pruning_schedule
@@ -100,6 +102,21 @@ class PruningWrapperTest(tf.test.TestCase):
                 'PruneLowMagnitude': pruning_wrapper.PruneLowMagnitude
             }).get_config())
 
+  def testMByNSerialization(self):
+    self.model.add(
+        Prune(layers.Dense(10), sparsity_m_by_n=(2, 4), **self.params))
+    self.model.build(input_shape=(1, 8))
+
+    # JSON has no tuples, so sparsity_m_by_n comes back as a list.
+    layer_config = json.loads(json.dumps(self.model.layers[0].get_config()))
+    self.assertEqual([2, 4], layer_config['sparsity_m_by_n'])
+
+    restored_layer = Prune.from_config(layer_config)
+    keras.Sequential([restored_layer]).build(input_shape=(1, 8))
+
+    self.assertLen(restored_layer.pruning_vars, 1)
+    self.assertEqual(layer_config, restored_layer.get_config())
+
 
 if __name__ == '__main__':
   tf.test.main()